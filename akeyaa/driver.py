@@ -1,9 +1,11 @@
 """Implement the Driver class for AkeyaaPy."""
 
 import bz2
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import csv
+import os
 import pickle
-import numpy as np
+import zipfile
 
 from akeyaa.wells import Wells
 from akeyaa.view import View
@@ -14,11 +16,13 @@ from akeyaa.show import show_results_by_venue, show_aquifers_by_venue
 __author__ = "Randal J Barnes"
 __version__ = "24 August 2020"
 
+RESULTS_CACHE_SIZE = 32         # most recent analyses kept for reuse
+
 
 # The following is a complete list of all 4-character aquifer codes used in
 # the Minnesota County Well index as of 1 January 2020. There are 10 groups
 # by first letter: {C, D, I, K, M, O, P, Q, R, U}.
-ALL_AQUIFERS = {
+ALL_AQUIFERS = frozenset({
     "CAMB", "CECR", "CEMS", "CJDN", "CJDW", "CJMS", "CJSL", "CJTC", "CLBK",
     "CMFL", "CMRC", "CMSH", "CMTS", "CSLT", "CSLW", "CSTL", "CTCE", "CTCG",
     "CTCM", "CTCW", "CTLR", "CTMZ", "CWEC", "CWMS", "CWOC",
@@ -49,6 +53,22 @@ ALL_AQUIFERS = {
     "QBAA", "QBUA", "QUUU", "QWTA",
     "RUUU",
     "UREG"
+})
+
+# The aquifer codes grouped by their first letter, which is how the aquifers
+# are selected in the user interface.
+AQUIFERS_BY_LETTER = {
+    letter: frozenset(code for code in ALL_AQUIFERS if code[0] == letter)
+    for letter in "CDIKMOPQRU"
+}
+
+# The polygonal venue types, mapped to (venue class, venue_data list name).
+POLYGON_VENUES = {
+    "City": (City, "city_list"),
+    "Township": (Township, "township_list"),
+    "County": (County, "county_list"),
+    "Watershed": (Watershed, "watershed_list"),
+    "Subregion": (Subregion, "subregion_list"),
 }
 
 
@@ -106,25 +126,51 @@ class Driver:
     def __init__(self):
         """Initialize the entire AkeyaaPy system."""
 
-        # Get the pre-digested well data.
-        pklzfile = r"..\data\Akeyaa_Wells.pklz"
-        with bz2.open(pklzfile, "rb") as fileobject:
-            self.well_list = pickle.load(fileobject)
-        self.wells = Wells(self.well_list)
-
-        # Get the pre-digested venue data.
-        pklzfile = r"..\data\Akeyaa_Venues.pklz"
-        with bz2.open(pklzfile, "rb") as fileobject:
-            self.venue_data = pickle.load(fileobject)
+        # The two data sets are independent, so the venue data are loaded on a
+        # background thread while the well data are loaded here.
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            venue_future = executor.submit(load_pklz, r"..\data\Akeyaa_Venues.pklz")
+
+            # Get the pre-digested well data, from the array cache if it is at
+            # least as new as the pickle it was built from.
+            pklzfile = r"..\data\Akeyaa_Wells.pklz"
+            npzfile = r"..\data\Akeyaa_Wells.npz"
+            self.wells = None
+            if os.path.isfile(npzfile) and (
+                not os.path.isfile(pklzfile)
+                or os.path.getmtime(npzfile) >= os.path.getmtime(pklzfile)
+            ):
+                try:
+                    self.wells = Wells.load(npzfile)
+                except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+                    pass                # A damaged cache is rebuilt below.
+
+            if self.wells is None:
+                self.wells = Wells(load_pklz(pklzfile))
+                try:
+                    self.wells.save(npzfile)
+                except OSError:
+                    pass                # The cache is optional.
+
+            # Get the pre-digested venue data.
+            self.venue_data = venue_future.result()
 
         # Initialize the results.
+        self.results_cache = {}
         self.results = None
         self.target_values = None
         self.aquifer_info = None
 
+        # The worker processes for the local fits are started once, on first
+        # use, and shared by every run in the session.
+        self.executor = ProcessPoolExecutor()
+
         # Execute the graphical user interface.
-        self.view = View(self.venue_data, self.run_callback, self.save_callback)
-        self.view.mainloop()
+        try:
+            self.view = View(self.venue_data, self.run_callback, self.save_callback)
+            self.view.mainloop()
+        finally:
+            self.executor.shutdown()
 
     def run_callback(self, selected_venue, selected_aquifers, parameters):
         """Run the AkeyaaPy model and create the resulting plots.
@@ -187,45 +233,17 @@ class Driver:
 
         """
         # Create the requested Venue.
-        if selected_venue["type"] == "City":
-            city_list = self.venue_data["city_list"]
-            venue = City(
+        if selected_venue["type"] in POLYGON_VENUES:
+            venue_class, list_name = POLYGON_VENUES[selected_venue["type"]]
+            venue = venue_class(
                 name=selected_venue["name"],
                 code=selected_venue["code"],
-                vertices=city_list[selected_venue["index"]][2]
-            )
-        elif selected_venue["type"] == "Township":
-            township_list = self.venue_data["township_list"]
-            venue = Township(
-                name=selected_venue["name"],
-                code=selected_venue["code"],
-                vertices=township_list[selected_venue["index"]][2]
-            )
-        elif selected_venue["type"] == "County":
-            county_list = self.venue_data["county_list"]
-            venue = County(
-                name=selected_venue["name"],
-                code=selected_venue["code"],
-                vertices=county_list[selected_venue["index"]][2]
-            )
-        elif selected_venue["type"] == "Watershed":
-            watershed_list = self.venue_data["watershed_list"]
-            venue = Watershed(
-                name=selected_venue["name"],
-                code=selected_venue["code"],
-                vertices=watershed_list[selected_venue["index"]][2]
-            )
-        elif selected_venue["type"] == "Subregion":
-            subregion_list = self.venue_data["subregion_list"]
-            venue = Subregion(
-                name=selected_venue["name"],
-                code=selected_venue["code"],
-                vertices=subregion_list[selected_venue["index"]][2]
+                vertices=self.venue_data[list_name][selected_venue["index"]][2]
             )
         elif selected_venue["type"] == "Neighborhood":
             venue = Neighborhood(
                 name=selected_venue["name"],
-                point=np.array([selected_venue["easting"], selected_venue["northing"]], dtype=float),
+                point=(selected_venue["easting"], selected_venue["northing"]),
                 radius=selected_venue["radius"]
             )
         elif selected_venue["type"] == "Frame":
@@ -239,18 +257,25 @@ class Driver:
         else:
             raise ValueError("Unknown venue type")
 
-        # Create the complete list of requested aquifers.
-        aquifers = []
-        for aquifer in ALL_AQUIFERS:
-            if aquifer[0] in selected_aquifers:
-                aquifers.append(aquifer)
+        # Create the complete set of requested aquifers.
+        aquifers = frozenset().union(
+            *(AQUIFERS_BY_LETTER.get(letter, ()) for letter in selected_aquifers)
+        )
 
         print("EXECUTE AKEYAA")
         print(f"{selected_venue}")
         print(f"{selected_aquifers}")
         print(f"{parameters}")
 
-        self.results = model_by_venue(self.wells, venue, aquifers, parameters)
+        # Reuse the analysis if this exact run was made recently.
+        key = (venue, aquifers, tuple(sorted(parameters.items())))
+        if key in self.results_cache:
+            self.results = self.results_cache.pop(key)
+        else:
+            self.results = model_by_venue(self.wells, venue, aquifers, parameters, self.executor)
+            if len(self.results_cache) >= RESULTS_CACHE_SIZE:
+                del self.results_cache[next(iter(self.results_cache))]
+        self.results_cache[key] = self.results
         self.target_values = show_results_by_venue(venue, self.results)
         self.aquifer_info = show_aquifers_by_venue(self.wells, venue, aquifers, parameters)
 
@@ -269,18 +294,24 @@ class Driver:
         """
         with open(filename, mode="w", newline="") as csv_file:
             writer = csv.writer(csv_file, delimiter=',', quotechar='"', quoting=csv.QUOTE_NONNUMERIC)
-            writer.writerow(["xtarget", "ytarget", "xvec", "yvec", "p10", "ntarget", "head", "magnitude", "score"])
-
-            number_of_target_values = len(self.target_values["xtarget"])
-            for i in range(number_of_target_values):
-                writer.writerow([
-                    self.target_values["xtarget"][i],
-                    self.target_values["ytarget"][i],
-                    self.target_values["xvec"][i],
-                    self.target_values["yvec"][i],
-                    self.target_values["p10"][i],
-                    self.target_values["ntarget"][i],
-                    self.target_values["head"][i],
-                    self.target_values["magnitude"][i],
-                    self.target_values["score"][i]
-                ])
+            columns = ["xtarget", "ytarget", "xvec", "yvec", "p10", "ntarget", "head", "magnitude", "score"]
+            writer.writerow(columns)
+            writer.writerows(zip(*(self.target_values[key] for key in columns)))
+
+
+def load_pklz(pklzfile):
+    """Load the object stored in a bzip2-compressed pickle file.
+
+    Arguments
+    ---------
+    pklzfile : str
+        The name of the .pklz file.
+
+    Returns
+    -------
+    object
+        The unpickled object.
+
+    """
+    with bz2.open(pklzfile, "rb") as fileobject:
+        return pickle.load(fileobject)
@@ -25,6 +25,7 @@ akeyaa.venues
 from abc import ABC, abstractmethod
 import numpy as np
 from matplotlib.path import Path
+from scipy.spatial import ConvexHull, QhullError
 
 __author__ = "Randal J Barnes"
 __version__ = "11 August 2020"
@@ -139,11 +140,14 @@ class Circle(Shape):
 
     def __eq__(self, other):
         """Return True if the two Circle are equal."""
-        return (
-            (self.__class__ == other.__class__)
-            and (np.all(self.center == other.center))
-            and (self.radius == other.radius)
-        )
+        return (self.__class__ == other.__class__) and (self._key() == other._key())
+
+    def __hash__(self):
+        return hash((self.__class__.__name__, self._key()))
+
+    def _key(self):
+        """Return the defining scalars (xcenter, ycenter, radius) as a tuple."""
+        return (float(self.center[0]), float(self.center[1]), self.radius)
 
     def boundary(self):
         """Return the boundary vertices (domain to the left)."""
@@ -189,8 +193,10 @@ class Circle(Shape):
 
     def contains_points(self, points):
         """Returns a bool array which is True if the Circle contains the point."""
-        return [np.hypot(point[0] - self.center[0], point[1] - self.center[1]) < self.radius
-                for point in points]
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        return (
+            np.hypot(points[:, 0] - self.center[0], points[:, 1] - self.center[1]) < self.radius
+        )
 
 
 class Rectangle(Shape):
@@ -240,6 +246,9 @@ class Rectangle(Shape):
             and (self.ymax == other.ymax)
         )
 
+    def __hash__(self):
+        return hash((self.__class__.__name__, self.xmin, self.xmax, self.ymin, self.ymax))
+
     def boundary(self):
         """Return the boundary vertices (domain to the left)."""
         return np.array(
@@ -284,8 +293,11 @@ class Rectangle(Shape):
 
     def contains_points(self, points):
         """Returns a bool array which is True if the rectangle contains the point."""
-        return [(self.xmin < point[0] < self.xmax) and (self.ymin < point[1] < self.ymax)
-                for point in points]
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        return (
+            (self.xmin < points[:, 0]) & (points[:, 0] < self.xmax) &
+            (self.ymin < points[:, 1]) & (points[:, 1] < self.ymax)
+        )
 
 
 class Polygon(Shape):
@@ -298,6 +310,24 @@ class Polygon(Shape):
         The vertices are stored so that the domain is on the left, and the
         first vertex is repeated as the last vertex.
 
+    path : matplotlib.path.Path
+        The boundary as a Path, built once and used for the (compiled)
+        point-in-polygon tests.
+
+    xmin, xmax, ymin, ymax : float
+        The bounding axis-aligned rectangle, used to reject far-away points
+        before any point-in-polygon test.
+
+    hull : matplotlib.path.Path
+        The convex hull of the vertices as a Path. The hull has far fewer
+        vertices than a typical venue boundary, so it serves as a cheap
+        prefilter for the point-in-polygon tests. For a degenerate boundary,
+        which has no hull, this is the path itself.
+
+    convex : bool
+        True if every vertex is on the convex hull, in which case the hull
+        test alone decides containment.
+
     """
 
     def __init__(self, vertices):
@@ -308,6 +338,19 @@ class Polygon(Shape):
         self.xmin, self.ymin = np.min(self.vertices, axis=0)
         self.xmax, self.ymax = np.max(self.vertices, axis=0)
 
+        self.path = Path(self.vertices)
+
+        try:
+            indx = ConvexHull(self.vertices).vertices
+        except QhullError:
+            # A degenerate (e.g. collinear) boundary has no hull; fall back
+            # to the exact path test.
+            self.hull = self.path
+            self.convex = False
+        else:
+            self.hull = Path(self.vertices[np.append(indx, indx[0])])
+            self.convex = len(indx) == len(np.unique(self.vertices, axis=0))
+
     def __repr__(self):
         return f"{self.__class__.__name__}(vertices = {self.vertices})"
 
@@ -316,10 +359,13 @@ class Polygon(Shape):
 
     def __eq__(self, other):
         """Return True if the two Polygons are equal."""
-        return (self.__class__ == other.__class__) and np.all(
-            self.vertices == other.vertices
+        return (self.__class__ == other.__class__) and np.array_equal(
+            self.vertices, other.vertices
         )
 
+    def __hash__(self):
+        return hash((self.__class__.__name__, self.vertices.tobytes()))
+
     def boundary(self):
         """Return the boundary vertices (domain to the left)."""
         return self.vertices
@@ -340,46 +386,36 @@ class Polygon(Shape):
         """Return the centroid as a point."""
         x = self.vertices[:, 0]
         y = self.vertices[:, 1]
-
-        sumx = 0.0
-        sumy = 0.0
-
-        for i in range(len(self.vertices) - 1):
-            sumx += (x[i] + x[i + 1]) * (x[i] * y[i + 1] - x[i + 1] * y[i])
-            sumy += (y[i] + y[i + 1]) * (x[i] * y[i + 1] - x[i + 1] * y[i])
+        cross = x[:-1] * y[1:] - x[1:] * y[:-1]
 
         area = self.area()
-        sumx /= 6 * area
-        sumy /= 6 * area
+        sumx = np.sum((x[:-1] + x[1:]) * cross) / (6 * area)
+        sumy = np.sum((y[:-1] + y[1:]) * cross) / (6 * area)
         return np.array([sumx, sumy], dtype=float)
 
     def area(self):
         """Return the area [m^2]."""
         x = self.vertices[:, 0]
         y = self.vertices[:, 1]
-
-        area = 0.0
-        for i in range(len(self.vertices) - 1):
-            area += x[i] * y[i + 1] - x[i + 1] * y[i]
-        area /= 2
-        return area
+        return np.sum(x[:-1] * y[1:] - x[1:] * y[:-1]) / 2
 
     def perimeter(self):
         """Return the length of the perimeter [m]."""
-        x = self.vertices[:, 0]
-        y = self.vertices[:, 1]
-
-        length = 0.0
-        for i in range(len(self.vertices) - 1):
-            length += np.hypot(x[i + 1] - x[i], y[i + 1] - y[i])
-        return length
+        return np.sum(np.hypot(np.diff(self.vertices[:, 0]), np.diff(self.vertices[:, 1])))
 
     def contains_point(self, point):
         """Return True if the Polygon contains the point."""
-        path = Path(self.vertices)
-        return path.contains_point(point)
+        return self.path.contains_point(point)
 
     def contains_points(self, points):
-        """Returns a bool array which is True if the rectangle contains the point."""
-        path = Path(self.vertices)
-        return path.contains_points(points)
+        """Returns a bool array which is True if the polygon contains the point."""
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        flag = (
+            (self.xmin <= points[:, 0]) & (points[:, 0] <= self.xmax) &
+            (self.ymin <= points[:, 1]) & (points[:, 1] <= self.ymax)
+        )
+        if np.any(flag):
+            flag[flag] = self.hull.contains_points(points[flag])
+        if not self.convex and np.any(flag):
+            flag[flag] = self.path.contains_points(points[flag])
+        return flag
@@ -28,15 +28,66 @@ potential model.
 Data from outside of the venue may be used in the computations.
 
 """
-from itertools import compress
 import numpy as np
-import statsmodels.api as sm
+import scipy.linalg
 
 __author__ = "Randal J Barnes"
 __version__ = "24 August 2020"
 
+FIT_CHUNKSIZE = 64              # targets sent to a worker process at a time
+PARALLEL_MINIMUM = 256          # fewer selected targets are fitted serially
+TARGET_CHUNKSIZE = 1024         # targets searched and fitted per block
 
-def model_by_venue(wells, venue, aquifers, parameters):
+TUKEY_C = 4.685                 # Tukey biweight tuning constant
+MAD_NORMALIZER = 0.6744897501960817     # scipy.stats.norm.ppf(0.75)
+IRLS_TOLERANCE = 1e-8           # convergence tolerance on the deviance
+IRLS_MAXITER = 50               # maximum number of IRLS iterations
+PIVOT_TOLERANCE = 1e-10         # relative Cholesky pivot for a singular fit
+
+
+class Results:
+    """The results of an Akeyaa analysis across a venue.
+
+    The results are stored by column: one array per quantity, with one
+    row per retained target location.
+
+    Attributes
+    ----------
+    xytarget : ndarray, shape=(m, 2), dtype=float
+        x- and y-coordinates of the target locations.
+
+    ntarget : ndarray, shape=(m,), dtype=int
+        number of nearby wells used in each local analysis.
+
+    evp : ndarray, shape=(m, 6), dtype=float
+        expected value vectors of the model parameters.
+
+    varp : ndarray, shape=(m, 6, 6), dtype=float
+        variance/covariance matrices of the model parameters.
+
+    """
+
+    def __init__(self, xytarget, ntarget, evp, varp):
+        self.xytarget = xytarget
+        self.ntarget = ntarget
+        self.evp = evp
+        self.varp = varp
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(<{len(self)} targets>)"
+
+    def __len__(self):
+        return len(self.ntarget)
+
+    def to_records(self):
+        """Return the results as a list[tuple] (xytarget, n, evp, varp)."""
+        return [
+            (tuple(self.xytarget[i]), int(self.ntarget[i]), self.evp[i], self.varp[i])
+            for i in range(len(self))
+        ]
+
+
+def model_by_venue(wells, venue, aquifers, parameters, executor=None):
     """Compute the Akeyaa analysis across the specified venue.
 
     Arguments
@@ -78,41 +129,73 @@ def model_by_venue(wells, venue, aquifers, parameters):
         ["lastyear"] : int
             Water levels measured after lastyear, YYYY, are not included.
 
+    executor : concurrent.futures.Executor, optional
+        A pool of worker processes for the local fits, created once and
+        reused across runs. If None, all of the fits are done serially.
+
     Returns
     -------
-    results : list[tuple] (xytarget, n, evp, varp)
-
-        xytarget : tuple (float, float)
-            x- and y-coordinates of target location.
-        n : int
-            number of naerby wells used in the local analysis.
-        evp : (6, 1) ndarray
-            expected value vector of the model parameters.
-        varp : (6, 6) ndarray
-            variance/covariance matrix of the model parameters.
+    results : Results
+        The column-wise results for all retained target locations. Use
+        ``results.to_records()`` for a list[tuple] (xytarget, n, evp, varp).
 
     See Also
     --------
     akeyaa.wells
 
+    Notes
+    -----
+    The target locations are processed in blocks of TARGET_CHUNKSIZE. The
+    well neighborhoods for all of the targets in a block are fetched in one
+    batched kd-tree search, and the independent local fits are then
+    distributed across the `executor`'s worker processes. Only one block of
+    neighborhoods is held in memory at a time.
+
+    A block with fewer than PARALLEL_MINIMUM selected targets is fitted
+    serially, since shipping it to the workers costs more than the fits.
+
     """
-    targets = layout_the_targets(venue, parameters["spacing"])
+    radius = parameters["radius"]
+    required = parameters["required"]
+    firstyear = parameters["firstyear"]
+    lastyear = parameters["lastyear"]
 
-    results = []
-    for xytarget in targets:
-        welldata = wells.fetch(
-            xytarget,
-            parameters["radius"],
-            aquifers,
-            parameters["firstyear"],
-            parameters["lastyear"]
-        )
-        if len(welldata) >= parameters["required"]:
-            xyz = [row[0:2] for row in welldata]
-            evp, varp = fit_conic_potential(xytarget, xyz)
-            results.append((xytarget, len(xyz), evp, varp))
+    targets = layout_the_targets(venue, parameters["spacing"])
 
-    return results
+    xytargets = []
+    ntargets = []
+    evps = []
+    varps = []
+
+    for start in range(0, len(targets), TARGET_CHUNKSIZE):
+        block = targets[start:start + TARGET_CHUNKSIZE]
+        neighborhoods = wells.fetch_neighborhoods(block, radius, aquifers, firstyear, lastyear)
+
+        selected = [
+            (xytarget, indx) for xytarget, indx in zip(block, neighborhoods)
+            if len(indx) >= required
+        ]
+        xyzs = [wells.xyz[indx] for _, indx in selected]
+
+        xytargets.extend(xytarget for xytarget, _ in selected)
+        ntargets.extend(len(indx) for _, indx in selected)
+        if executor is None or len(selected) < PARALLEL_MINIMUM:
+            fits = map(fit_conic_potential, [xytarget for xytarget, _ in selected], xyzs)
+        else:
+            fits = executor.map(
+                fit_conic_potential, [xytarget for xytarget, _ in selected], xyzs,
+                chunksize=FIT_CHUNKSIZE
+            )
+        for evp, varp in fits:
+            evps.append(evp)
+            varps.append(varp)
+
+    xytargets = np.array(xytargets, dtype=float).reshape(-1, 2)
+    ntargets = np.array(ntargets, dtype=int)
+    evps = np.array(evps, dtype=float).reshape(-1, 6)
+    varps = np.array(varps, dtype=float).reshape(-1, 6, 6)
+
+    return Results(xytargets, ntargets, evps, varps)
 
 
 def layout_the_targets(venue, spacing):
@@ -138,7 +221,7 @@ def layout_the_targets(venue, spacing):
 
     Returns
     -------
-    targets : list[tuple] (xtarget, ytarget)
+    targets : ndarray, shape=(m, 2), dtype=float
         x- and y-coordinates of the target points.
 
     See Also
@@ -146,26 +229,20 @@ def layout_the_targets(venue, spacing):
     akeyaa.venues
 
     """
-    xgrd = [venue.centroid()[0]]
-    while xgrd[-1] > venue.extent()[0]:
-        xgrd.append(xgrd[-1] - spacing)
-    xgrd.reverse()
-    while xgrd[-1] < venue.extent()[1]:
-        xgrd.append(xgrd[-1] + spacing)
-
-    ygrd = [venue.centroid()[1]]
-    while ygrd[-1] > venue.extent()[2]:
-        ygrd.append(ygrd[-1] - spacing)
-    ygrd.reverse()
-    while ygrd[-1] < venue.extent()[3]:
-        ygrd.append(ygrd[-1] + spacing)
-
-    xygrd = []
-    for x in xgrd:
-        for y in ygrd:
-            xygrd.append((x, y))
+    xcenter, ycenter = venue.centroid()
+    xmin, xmax, ymin, ymax = venue.extent()
+
+    xgrd = xcenter + spacing * np.arange(
+        -np.ceil((xcenter - xmin) / spacing), np.ceil((xmax - xcenter) / spacing) + 1
+    )
+    ygrd = ycenter + spacing * np.arange(
+        -np.ceil((ycenter - ymin) / spacing), np.ceil((ymax - ycenter) / spacing) + 1
+    )
+
+    xx, yy = np.meshgrid(xgrd, ygrd, indexing="ij")
+    xygrd = np.column_stack([xx.ravel(), yy.ravel()])
     flag = venue.contains_points(xygrd)
-    return list(compress(xygrd, flag))
+    return xygrd[flag]
 
 
 def fit_conic_potential(xytarget, xyz):
@@ -177,13 +254,9 @@ def fit_conic_potential(xytarget, xyz):
         The x- and y-coordinates in "NAD 83 UTM 15N" (EPSG:26915) [m] of
         the target location.
 
-    xyz : list[tuple]
-        each tuple is of the form ((x, y), z), where
-
-        (x, y) : tuple(float, float)
-            The x- and y-coordinates in "NAD 83 UTM 15N" (EPSG:26915) [m].
-        z : float
-            The recorded static water level [ft]
+    xyz : ndarray, shape=(n, 3), dtype=float
+        The x- and y-coordinates in "NAD 83 UTM 15N" (EPSG:26915) [m], and
+        the recorded static water levels [ft], of the selected wells.
 
     Returns
     -------
@@ -195,7 +268,7 @@ def fit_conic_potential(xytarget, xyz):
 
     See Also
     --------
-    statsmodels.RLM
+    fit_tukey_biweight
 
     Notes
     -----
@@ -206,16 +279,162 @@ def fit_conic_potential(xytarget, xyz):
     where the fitted parameters map as: [A, B, C, D, E, F] = p[0:5].
 
     """
-    x = np.array([row[0][0] for row in xyz], dtype=float) - xytarget[0]
-    y = np.array([row[0][1] for row in xyz], dtype=float) - xytarget[1]
-    z = np.array([row[1] for row in xyz], dtype=float) * 0.3048                 # [ft] to [m].
+    x = xyz[:, 0] - xytarget[0]
+    y = xyz[:, 1] - xytarget[1]
+    z = xyz[:, 2] * 0.3048                                                      # [ft] to [m].
+
+    # Fill the design matrix column by column, in Fortran order, so that
+    # each column is contiguous and no temporary columns are allocated.
+    exog = np.empty((len(z), 6), dtype=float, order="F")
+    np.multiply(x, x, out=exog[:, 0])
+    np.multiply(y, y, out=exog[:, 1])
+    np.multiply(x, y, out=exog[:, 2])
+    exog[:, 3] = x
+    exog[:, 4] = y
+    exog[:, 5] = 1.0
+    return fit_tukey_biweight(exog, z)
+
+
+def fit_tukey_biweight(exog, z):
+    """Fit a linear model using Tukey biweight robust regression.
 
-    exog = np.stack([x**2, y**2, x*y, x, y, np.ones(x.shape)], axis=1)
+    Parameters
+    ----------
+    exog : (n, p) ndarray
+        The design matrix.
 
-    method_norm = sm.robust.norms.TukeyBiweight()
-    rlm_model = sm.RLM(z, exog, method_norm)
-    rlm_results = rlm_model.fit()
-    evp = rlm_results.params
-    varp = rlm_results.bcov_scaled
+    z : (n,) ndarray
+        The observed values.
 
+    Returns
+    -------
+    evp : (p,) ndarray
+        The expected value vector for the fitted model parameters.
+
+    varp : (p, p) ndarray
+        The variance/covariance matrix for the fitted model parameters.
+
+    See Also
+    --------
+    statsmodels.RLM
+
+    Notes
+    -----
+    This is iteratively reweighted least squares (IRLS) that reproduces
+    the defaults of ``statsmodels.RLM(z, exog, TukeyBiweight()).fit()``:
+    the scale is the median absolute deviation about zero, updated after
+    every iteration; convergence is declared when the change in the
+    deviance is at most IRLS_TOLERANCE; and the variance/covariance matrix
+    is Huber's H1 estimate.
+
+    The exception is a rank-deficient design (e.g. fewer than six distinct
+    well locations). The parameters are then not identifiable, and the
+    minimum-norm solution is taken in the column-scaled coordinates, so
+    evp generally differs from statsmodels' choice; the fitted values
+    exog @ evp still agree.
+
+    The columns of the design matrix differ in magnitude by many orders
+    of magnitude (e.g. x^2 versus 1), so the columns are scaled to a
+    maximum absolute value of one before the normal equations are formed
+    and factored; an all-zero column is left unscaled. The parameters and their variance/covariance matrix are
+    unscaled on return.
+
+    """
+    nobs, npar = exog.shape
+    colmax = np.max(np.abs(exog), axis=0)
+    colscale = np.divide(1.0, colmax, out=np.ones_like(colmax), where=colmax > 0)
+    design = exog * colscale
+
+    # One factorization yields both the ordinary least squares start and
+    # the unweighted (design' design)^-1 needed for the covariance.
+    solution = solve_normal_equations(
+        design.T @ design, np.column_stack([design.T @ z, np.eye(npar)])
+    )
+    params = solution[:, 0]
+    normalized_cov = solution[:, 1:]
+
+    # As in statsmodels, the deviance is measured against the weighted
+    # least squares variance of the residuals, not against the MAD scale.
+    resid = z - design @ params
+    scale = np.median(np.abs(resid)) / MAD_NORMALIZER
+    deviance = np.sum(tukey_rho(resid / (resid @ resid / (nobs - npar))))
+
+    for _ in range(1, IRLS_MAXITER):
+        if scale == 0.0:
+            break
+        weights = tukey_weights(resid / scale)
+        wdesign = design * weights[:, np.newaxis]
+        params = solve_normal_equations(wdesign.T @ design, wdesign.T @ z)
+
+        resid = z - design @ params
+        scale = np.median(np.abs(resid)) / MAD_NORMALIZER
+
+        previous = deviance
+        deviance = np.sum(tukey_rho(resid / ((weights * resid) @ resid / (nobs - npar))))
+        if np.abs(deviance - previous) <= IRLS_TOLERANCE:
+            break
+
+    sresid = resid / scale
+    psi = sresid * tukey_weights(sresid)
+    psi_deriv = tukey_psi_deriv(sresid)
+
+    m = np.mean(psi_deriv)
+    k = 1 + npar / nobs * np.var(psi_deriv) / m**2
+    factor = k**2 * (psi @ psi * scale**2 / (nobs - npar)) / m**2
+
+    evp = colscale * params
+    varp = factor * normalized_cov * np.outer(colscale, colscale)
     return (evp, varp)
+
+
+def solve_normal_equations(gram, rhs):
+    """Solve the symmetric normal equations, tolerating a singular design.
+
+    Parameters
+    ----------
+    gram : (p, p) ndarray
+        The symmetric positive semi-definite matrix X'WX.
+
+    rhs : (p,) or (p, k) ndarray
+        The right-hand side(s).
+
+    Returns
+    -------
+    solution : (p,) or (p, k) ndarray
+        The solution of gram @ solution = rhs. If gram is singular, this is
+        the minimum-norm solution.
+
+    Notes
+    -----
+    A neighborhood with too few distinct well locations (e.g. repeated
+    measurements at a handful of wells) gives a rank-deficient design. In
+    that case the Cholesky factorization fails, or is numerically
+    meaningless, and the pseudoinverse is used instead.
+
+    """
+    try:
+        factor = scipy.linalg.cho_factor(gram)
+        pivots = np.abs(np.diag(factor[0]))
+        if np.min(pivots) > PIVOT_TOLERANCE * np.max(pivots):
+            return scipy.linalg.cho_solve(factor, rhs)
+    except np.linalg.LinAlgError:
+        pass
+    return np.linalg.pinv(gram) @ rhs
+
+
+def tukey_weights(u):
+    """Return the Tukey biweight IRLS weights, (1 - (u/c)^2)^2 for |u| <= c."""
+    t = np.square(u / TUKEY_C)
+    return np.where(t <= 1.0, np.square(1.0 - t), 0.0)
+
+
+def tukey_rho(u):
+    """Return the Tukey biweight criterion, c^2/6 (1 - (1 - (u/c)^2)^3)."""
+    t = np.minimum(np.square(u / TUKEY_C), 1.0)
+    return TUKEY_C**2 / 6.0 * (1.0 - (1.0 - t)**3)
+
+
+def tukey_psi_deriv(u):
+    """Return the derivative of the Tukey biweight psi function."""
+    t = np.square(u / TUKEY_C)
+    return np.where(t <= 1.0, (1.0 - t) * (1.0 - 5.0 * t), 0.0)
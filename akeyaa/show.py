@@ -63,16 +63,9 @@ def show_results_by_venue(venue, results):
         user-defined domain, as enumerated and detailed in `venues.py`.
         For example: a ``City``, ``Watershed``, or ``Neighborhood``.
 
-    results : list[tuples] (xytarget, n, evp, varp)
-
-        - xytarget : tuple(float, float)
-            x- and y-coordinates of target location.
-        - n : int
-            number of neighborhood wells used in the local analysis.
-        - evp : ndarray, shape=(6,1)
-            expected value vector of the prarameters.
-        - varp : ndarray, shape=(6,6)
-            variance/covariance matrix of the parameters.
+    results : Results
+        The column-wise results of the Akeyaa analysis, as detailed in
+        `akeyaa.model`.
 
     Returns
     -------
@@ -112,8 +105,8 @@ def local_flow_direction(venue, results):
     +/- 10 degrees of the drawn arrow.
 
     """
-    xtarget = np.array([row[0][0] for row in results])
-    ytarget = np.array([row[0][1] for row in results])
+    xtarget = results.xytarget[:, 0]
+    ytarget = results.xytarget[:, 1]
 
     bdry = venue.boundary()
 
@@ -122,9 +115,7 @@ def local_flow_direction(venue, results):
 
     p10 = np.empty(xtarget.shape)
 
-    for i, row in enumerate(results):
-        evp = row[2]
-        varp = row[3]
+    for i, (evp, varp) in enumerate(zip(results.evp, results.varp)):
         mu = evp[3:5]
         sigma = varp[3:5, 3:5]
 
@@ -166,9 +157,9 @@ def local_number_of_wells(venue, results):
     color-coded markers.
 
     """
-    xtarget = np.array([row[0][0] for row in results])
-    ytarget = np.array([row[0][1] for row in results])
-    ntarget = np.array([row[1] for row in results], dtype=int)
+    xtarget = results.xytarget[:, 0]
+    ytarget = results.xytarget[:, 1]
+    ntarget = results.ntarget
 
     bdry = venue.boundary()
 
@@ -195,15 +186,12 @@ def local_head(venue, results):
     as color-coded markers.
 
     """
-    xtarget = np.array([row[0][0] for row in results])
-    ytarget = np.array([row[0][1] for row in results])
+    xtarget = results.xytarget[:, 0]
+    ytarget = results.xytarget[:, 1]
 
     bdry = venue.boundary()
 
-    head = np.empty(xtarget.shape)
-    for i, row in enumerate(results):
-        evp = row[2]
-        head[i] = 3.28084 * evp[5]          # convert [m] to [ft].
+    head = 3.28084 * results.evp[:, 5]      # convert [m] to [ft].
 
     plt.figure(figsize=FIGSIZE)
     plt.axis("equal")
@@ -228,16 +216,12 @@ def local_gradient(venue, results):
     gradient as color-coded markers.
 
     """
-    xtarget = np.array([row[0][0] for row in results])
-    ytarget = np.array([row[0][1] for row in results])
+    xtarget = results.xytarget[:, 0]
+    ytarget = results.xytarget[:, 1]
 
     bdry = venue.boundary()
 
-    magnitude = np.empty(xtarget.shape)
-    for i, row in enumerate(results):
-        evp = row[2]
-        mu = evp[3:5]
-        magnitude[i] = np.hypot(mu[0], mu[1])
+    magnitude = np.hypot(results.evp[:, 3], results.evp[:, 4])
 
     plt.figure(figsize=FIGSIZE)
     plt.axis("equal")
@@ -265,19 +249,17 @@ def local_laplacian_zscore(venue, results):
     infiltration, red values (positive) indicate local net exfiltration.
 
     """
-    xtarget = np.array([row[0][0] for row in results])
-    ytarget = np.array([row[0][1] for row in results])
+    xtarget = results.xytarget[:, 0]
+    ytarget = results.xytarget[:, 1]
 
     bdry = venue.boundary()
 
-    score = np.empty(xtarget.shape)
-    for i, row in enumerate(results):
-        evp = row[2]
-        varp = row[3]
+    evp = results.evp
+    varp = results.varp
 
-        laplacian = 2*(evp[0]+evp[1])
-        stdev = 2*np.sqrt(varp[0, 0] + varp[1, 1] + 2*varp[0, 1])
-        score[i] = min(max(laplacian/stdev, -3), 3)
+    laplacian = 2*(evp[:, 0]+evp[:, 1])
+    stdev = 2*np.sqrt(varp[:, 0, 0] + varp[:, 1, 1] + 2*varp[:, 0, 1])
+    score = np.clip(laplacian/stdev, -3, 3)
 
     plt.figure(figsize=FIGSIZE)
     plt.axis("equal")
@@ -359,13 +341,13 @@ def show_aquifers_by_venue(wells, venue, aquifers, parameters):
     lastyear = parameters["lastyear"]
     bdry = venue.boundary()
 
-    welldata = wells.fetch_by_venue(venue, aquifers, firstyear, lastyear)
+    indx = wells.fetch_indices_by_venue(venue, aquifers, firstyear, lastyear)
 
-    print(f"number of wells found = {len(welldata)}")
+    print(f"number of wells found = {len(indx)}")
 
-    xsel = [row[0][0] for row in welldata]
-    ysel = [row[0][1] for row in welldata]
-    asel = [row[2] for row in welldata]
+    xsel = wells.xy[indx, 0]
+    ysel = wells.xy[indx, 1]
+    asel = wells.aquifer_codes[wells.aquifer_id[indx]]
 
     uaq, naq = np.unique(asel, return_counts=True)
     geo_hue, geo_hue_order, geo_palette = geologic_color_map(asel)
@@ -399,7 +381,7 @@ def geologic_color_map(aquifers):
 
     Parameters
     ----------
-    aquifers : list
+    aquifers : list or ndarray of str
         List of four-character aquifer abbreviation strings, as defined in
         Minnesota Geologic Survey's coding system.
 
@@ -429,11 +411,11 @@ def geologic_color_map(aquifers):
         "other": "darkblue",
     }
 
-    geo_hue = []
-    for aqui in aquifers:
-        if aqui[0] in {"Q", "K", "D", "O", "C", "P", "M"}:
-            geo_hue.append(aqui[0] + "xxx")
-        else:
-            geo_hue.append("other")
+    # Map each distinct aquifer code once, then look the wells up by code.
+    codes, inverse = np.unique(np.asarray(aquifers, dtype=str), return_inverse=True)
+    hues = np.array(
+        [code[0] + "xxx" if code[0] in "QKDOCPM" else "other" for code in codes], dtype=str
+    )
+    geo_hue = hues[inverse].tolist()
 
     return (geo_hue, geo_hue_order, geo_palette)
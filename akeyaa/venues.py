@@ -15,6 +15,9 @@ Notes
     - Neighborhood(Circle)      user-defined domain
     - Frame(Rectangle)          user-defined domain
 
+* The polygonal venues share their constructor, (name, code, vertices),
+  through the private base class _PolygonVenue(Polygon).
+
 * All of the classes in this module are of the informal type Venue.
   But Venue is not a formal abstract base class. Nonetheless, any Venue must
   have the following methods in addition to all of the methods promised
@@ -34,7 +37,31 @@ __author__ = "Randal J Barnes"
 __version__ = "16 August 2020"
 
 
-class City(Polygon):
+class _PolygonVenue(Polygon):
+    """The common constructor for the polygonal venues.
+
+    Attributes
+    ----------
+    name : str
+        The venue name.
+
+    code : str, int
+        The venue's unique identifying code.
+
+    vertices : ndarray, shape=(n, 2), dtype=float
+        An array of vertices; i.e. a 2D numpy array of (x, y) corredinates [m].
+        The vertices are stored so that the domain is on the left, and the
+        first vertex is repeated as the last vertex.
+
+    """
+
+    def __init__(self, name, code, vertices):
+        self.name = name
+        self.code = code
+        Polygon.__init__(self, vertices)
+
+
+class City(_PolygonVenue):
     """City venue by duck-type.
 
     Attributes
@@ -55,11 +82,6 @@ class City(Polygon):
 
     """
 
-    def __init__(self, name, code, vertices):
-        self.name = name
-        self.code = code
-        Polygon.__init__(self, vertices)
-
     def __repr__(self):
         return (
             f"{self.__class__.__name__}("
@@ -71,7 +93,7 @@ class City(Polygon):
         return f"City of {self.name}"
 
 
-class Township(Polygon):
+class Township(_PolygonVenue):
     """Township Venue-by-duck-type.
 
     Attributes
@@ -92,11 +114,6 @@ class Township(Polygon):
 
     """
 
-    def __init__(self, name, code, vertices):
-        self.name = name
-        self.code = code
-        Polygon.__init__(self, vertices)
-
     def __repr__(self):
         return (
             f"{self.__class__.__name__}("
@@ -108,7 +125,7 @@ class Township(Polygon):
         return f"{self.name} Township"
 
 
-class County(Polygon):
+class County(_PolygonVenue):
     """County Venue-by-duck-type.
 
     Attributes
@@ -129,11 +146,6 @@ class County(Polygon):
 
     """
 
-    def __init__(self, name, code, vertices):
-        self.name = name
-        self.code = code
-        Polygon.__init__(self, vertices)
-
     def __repr__(self):
         return (
             f"{self.__class__.__name__}("
@@ -145,7 +157,7 @@ class County(Polygon):
         return f"{self.name} County"
 
 
-class Watershed(Polygon):
+class Watershed(_PolygonVenue):
     """Watershed Venue-by-duck-type.
 
     Attributes
@@ -166,11 +178,6 @@ class Watershed(Polygon):
 
     """
 
-    def __init__(self, name, code, vertices):
-        self.name = name
-        self.code = code
-        Polygon.__init__(self, vertices)
-
     def __repr__(self):
         return (
             f"{self.__class__.__name__}("
@@ -181,11 +188,14 @@ class Watershed(Polygon):
     def __eq__(self, other):
         return (self.__class__ == other.__class__) and (self.code == other.code)
 
+    def __hash__(self):
+        return hash((self.__class__.__name__, self.code))
+
     def fullname(self):
         return f"{self.name} Watershed"
 
 
-class Subregion(Polygon):
+class Subregion(_PolygonVenue):
     """Subregion Venue-by-duck-type.
 
     Attributes
@@ -205,11 +215,6 @@ class Subregion(Polygon):
 
     """
 
-    def __init__(self, name, code, vertices):
-        self.name = name
-        self.code = code
-        Polygon.__init__(self, vertices)
-
     def __repr__(self):
         return (
             f"{self.__class__.__name__}("
@@ -252,7 +257,7 @@ class Neighborhood(Circle):
         else:
             self.name = "Neighborhood"
 
-        Circle.__init__(point, radius)
+        Circle.__init__(self, point, radius)
 
     def __repr__(self):
         return (
@@ -349,7 +354,7 @@ class Frame(Rectangle):
         return f"User Defined: {self.name}"
 
 
-class State(Polygon):
+class State(_PolygonVenue):
     """State Venue-by-duck-type.
 
     Attributes
@@ -370,11 +375,6 @@ class State(Polygon):
 
     """
 
-    def __init__(self, name, code, vertices):
-        self.name = name
-        self.code = code
-        Polygon.__init__(self, vertices)
-
     def __repr__(self):
         return (
             f"{self.__class__.__name__}("
@@ -1,8 +1,9 @@
 """Create Wells database for very fast lookup based on coordinates or relateid."""
 
-from bisect import bisect_left
-from itertools import compress
 from operator import itemgetter
+import os
+import tempfile
+import numpy as np
 import scipy
 
 __author__ = "Randal J Barnes"
@@ -40,10 +41,37 @@ class Wells:
 
             For example: ((232372.0, 5377518.0), 964.0, 'QBAA', '0000153720', '19650322')
 
-        relateid : list[str]
+        relateid : ndarray, shape=(N,), dtype=str
             The unique 10-digit well number encoded as a string with leading
-            zeros. This is a duplicate of the field realteid in __welldata to
-            be used as a search key.
+            zeros. This is a duplicate of the relateid field of each welldata
+            tuple, to be used as a search key.
+
+        xyz : ndarray, shape=(N, 3), dtype=float
+            The x- and y-coordinates [m] and the recorded static water
+            levels [ft] of all of the wells in welldata, packed one row per
+            well so that a neighborhood is gathered in a single pass.
+
+        xy : ndarray, shape=(N, 2), dtype=float
+            The x- and y-coordinates of all of the wells in welldata. This
+            is a view into xyz.
+
+        z : ndarray, shape=(N,), dtype=float
+            The recorded static water levels [ft] of all of the wells in
+            welldata. This is a view into xyz.
+
+        aquifer_codes : ndarray, shape=(K,), dtype=str
+            The sorted, distinct 4-character aquifer abbreviations found in
+            welldata.
+
+        aquifer_id : ndarray, shape=(N,), dtype=int
+            The aquifer of each of the wells in welldata, as an index into
+            aquifer_codes.
+
+        date : ndarray, shape=(N,), dtype=int
+            The measurement date, YYYYMMDD, of all of the wells in welldata.
+
+        year : ndarray, shape=(N,), dtype=int
+            The measurement year, YYYY, of all of the wells in welldata.
 
         tree : scipy.spatial.cKDTree
             A kd-tree for all of the wells in fetch.welldata.
@@ -56,14 +84,160 @@ class Wells:
             measurement.
 
         *   The welldata is sorted in ascending order by the relateid to allow for
-            quick searches on the relateid using the bisect tools.
+            quick binary searches on the relateid.
 
-        *   The relateid list is created as a search key.
+        *   The relateid array is created as a search key.
+
+        *   The well data are held by column, in the arrays above. The welldata
+            list of tuples is not kept; it is rebuilt from the columns on
+            first use.
 
         """
-        self.welldata = sorted(well_list, key=itemgetter(3))
-        self.relateid = [row[3] for row in self.welldata]
-        self.tree = scipy.spatial.cKDTree([row[0] for row in self.welldata])
+        welldata = sorted(well_list, key=itemgetter(3))
+        self._welldata = None
+        self.relateid = np.array([row[3] for row in welldata], dtype=str)
+
+        self.xyz = np.array(
+            [(*row[0], row[1]) for row in welldata], dtype=float
+        ).reshape(-1, 3)
+        self.aquifer_codes, self.aquifer_id = np.unique(
+            [row[2] for row in welldata], return_inverse=True
+        )
+        self.date = np.array([row[4] for row in welldata], dtype=int)
+
+        self._build_index()
+
+    def _build_index(self):
+        """Build the derived arrays and the kd-tree from the stored columns."""
+        self.xy = self.xyz[:, 0:2]
+        self.z = self.xyz[:, 2]
+        self.year = self.date // 10000
+
+        self.tree = scipy.spatial.cKDTree(self.xy)
+
+        self._filter_key = None
+        self._filter_mask = None
+
+    @property
+    def welldata(self):
+        """list[tuple] : (xy, z, aquifer, relateid, date) for every well."""
+        if self._welldata is None:
+            self._welldata = self._rows(np.arange(len(self.relateid)))
+        return self._welldata
+
+    def _rows(self, indx):
+        """Return the welldata tuples for the wells at the indices `indx`."""
+        xyz = self.xyz[indx]
+        return list(zip(
+            map(tuple, xyz[:, 0:2].tolist()),
+            xyz[:, 2].tolist(),
+            self.aquifer_codes[self.aquifer_id[indx]].tolist(),
+            self.relateid[indx].tolist(),
+            self.date[indx].tolist(),
+        ))
+
+    def save(self, npzfile):
+        """Save the well database as a cache of NumPy arrays.
+
+        Arguments
+        ---------
+        npzfile : str
+            The name of the .npz file.
+
+        Notes
+        -----
+        * The cache is read back by Wells.load, which is much faster than
+          decompressing and unpickling the original well list.
+
+        * The cache is written to a temporary file in the same directory and
+          then renamed into place, so an interrupted or failed write never
+          leaves a partial npzfile behind.
+
+        """
+        fd, tmpfile = tempfile.mkstemp(
+            suffix=".npz", dir=os.path.dirname(os.path.abspath(npzfile))
+        )
+        try:
+            with os.fdopen(fd, "wb") as fileobject:
+                np.savez(
+                    fileobject,
+                    xyz=self.xyz,
+                    aquifer_codes=self.aquifer_codes,
+                    aquifer_id=self.aquifer_id,
+                    relateid=self.relateid,
+                    date=self.date,
+                )
+            os.replace(tmpfile, npzfile)
+        except BaseException:
+            try:
+                os.remove(tmpfile)
+            except OSError:
+                pass
+            raise
+
+    @classmethod
+    def load(cls, npzfile):
+        """Load a well database saved by Wells.save.
+
+        Arguments
+        ---------
+        npzfile : str
+            The name of the .npz file.
+
+        Returns
+        -------
+        Wells
+            The well database.
+
+        """
+        wells = cls.__new__(cls)
+        with np.load(npzfile) as data:
+            wells.xyz = data["xyz"]
+            wells.aquifer_codes = data["aquifer_codes"]
+            wells.aquifer_id = data["aquifer_id"]
+            wells.relateid = data["relateid"]
+            wells.date = data["date"]
+
+        wells._welldata = None
+        wells._build_index()
+        return wells
+
+    def build_filter_mask(self, aquifers, firstyear, lastyear):
+        """Flag the welldata entries that satisfy the aquifer and year criteria.
+
+        Arguments
+        ---------
+        aquifers : list[str]
+            List of four-character aquifer abbreviation strings, as defined in
+            Minnesota Geologic Survey's coding system. If None, then wells
+            from all aquifers will be included.
+
+        firstyear : int
+            Water levels measured before firstyear, YYYY, are not included.
+
+        lastyear : int
+            Water levels measured after lastyear, YYYY, are not included.
+
+        Returns
+        -------
+        ndarray, shape=(n,), dtype=bool
+            True for each welldata entry that satisfies the criteria.
+
+        Notes
+        -----
+        * The most recent mask is cached, so repeated searches with the same
+          criteria (e.g. a venue analysis followed by its plot) build the
+          mask only once. The returned array must not be modified.
+
+        """
+        key = (None if aquifers is None else frozenset(aquifers), firstyear, lastyear)
+        if key != self._filter_key:
+            flag = (self.year >= firstyear) & (self.year <= lastyear)
+            if aquifers is not None:
+                flag &= np.isin(self.aquifer_codes, list(aquifers))[self.aquifer_id]
+            self._filter_key = key
+            self._filter_mask = flag
+        return self._filter_mask
 
     def fetch(self, xytarget, radius, aquifers, firstyear, lastyear):
         """Fetch the nearby wells.
@@ -106,18 +280,65 @@ class Wells:
         * Beware! The x and y coordinates are in [m], but z is in [ft].
 
         """
-        welldata = []
-        indx = self.tree.query_ball_point(xytarget, radius)
-        if indx:
-            for i in indx:
-                if (
-                    (self.welldata[i][2] in aquifers) and
-                    (self.welldata[i][4]//10000 >= firstyear) and
-                    (self.welldata[i][4]//10000 <= lastyear)
-                ):
-                    welldata.append(self.welldata[i])
-        return welldata
+        flag = self.build_filter_mask(aquifers, firstyear, lastyear)
+        indx = np.array(self.tree.query_ball_point(xytarget, radius), dtype=int)
+        return self._rows(indx[flag[indx]])
+
+    def fetch_neighborhoods(self, xytargets, radius, aquifers, firstyear, lastyear):
+        """Fetch the nearby wells for many target locations at once.
+
+        For each of the `xytargets`, fetch the indices of all authorized
+        wells within `radius` of the target, that are completed in one or
+        more of the identified `aquifers`, and that have a measured date
+        between `firstyear` and `lastyear`.
+
+        Arguments
+        ---------
+        xytargets : list[tuple(float, float)] or ndarray, shape=(m, 2)
+            x-coordinates (easting) and y-coordinates (northing) of the
+            target locations in NAD 83 UTM zone 15N [m].
+
+        radius : float
+            The radius of the search neighborhood [m].
+
+        aquifers : list[str]
+            List of four-character aquifer abbreviation strings, as defined in
+            Minnesota Geologic Survey's coding system. If None, then wells
+            from all aquifers will be included.
+
+        firstyear : int
+            Water levels measured before firstyear, YYYY, are not included.
+
+        lastyear : int
+            Water levels measured after lastyear, YYYY, are not included.
+
+        Returns
+        -------
+        list[ndarray] : (m,) list of int ndarrays
+            Returns one array of indices into welldata (and xyz, aquifer_id,
+            and year) for each target location. If there are no wells that
+            satisfy the search criteria for a target the array is empty.
+
+        Notes
+        -----
+        * All of the targets are searched in one call to the kd-tree, which
+          runs the searches in parallel across the available cores. The
+          indices within each neighborhood are not sorted; the fit does not
+          depend on their order.
+
+        """
+        flag = self.build_filter_mask(aquifers, firstyear, lastyear)
+
+        xytargets = np.asarray(xytargets, dtype=float).reshape(-1, 2)
+        neighborhoods = self.tree.query_ball_point(
+            xytargets, radius, workers=-1, return_sorted=False
+        )
 
+        result = []
+        for indx in neighborhoods:
+            indx = np.array(indx, dtype=int)
+            result.append(indx[flag[indx]])
+        return result
 
     def fetch_by_venue(self, venue, aquifers, firstyear, lastyear):
         """Fetch wells in the specified venue.
@@ -153,13 +374,51 @@ class Wells:
             returned.
 
         """
-        xycenter, radius = venue.circumcircle()
-        candidates = self.fetch(xycenter, radius, aquifers, firstyear, lastyear)
+        return self._rows(self.fetch_indices_by_venue(venue, aquifers, firstyear, lastyear))
 
-        if candidates:
-            flag = venue.contains_points([row[0] for row in candidates])
-            return list(compress(candidates, flag))
-        return []
+    def fetch_indices_by_venue(self, venue, aquifers, firstyear, lastyear):
+        """Fetch the indices of the wells in the specified venue.
+
+        This is fetch_by_venue without the welldata tuples: the same wells
+        are selected, but only their indices are returned.
+
+        Parameters
+        ----------
+        venue: type
+            An instance of a political division, administrative region, or
+            user-defined domain, as enumerated and detailed in `akeyaa.venues`.
+            For example: a ``City``, ``Watershed``, or ``Neighborhood``.
+
+        aquifers : list[str]
+            List of four-character aquifer abbreviation strings, as defined in
+            Minnesota Geologic Survey's coding system. If None, then wells from
+            all aquifers will be included.
+
+        firstyear : int
+            Water levels measured before firstyear, YYYY, are not included.
+
+        lastyear : int
+            Water levels measured after lastyear, YYYY, are not included.
+
+        Returns
+        -------
+        ndarray, shape=(n,), dtype=int
+            The indices into welldata (and xyz, aquifer_id, and year) of the
+            wells that satisfy the search criteria.
+
+        Notes
+        -----
+        * The filters are applied to well indices from the cheapest to the
+          most expensive -- the kd-tree search of the venue's circumcircle,
+          the aquifer/year mask, then the venue's containment test.
+
+        """
+        flag = self.build_filter_mask(aquifers, firstyear, lastyear)
+
+        xycenter, radius = venue.circumcircle()
+        indx = np.array(self.tree.query_ball_point(xycenter, radius), dtype=int)
+        indx = indx[flag[indx]]
+        return indx[venue.contains_points(self.xy[indx])]
 
 
     def fetch_by_relateid(self, relateid):
@@ -188,7 +447,7 @@ class Wells:
         if isinstance(relateid, int):
             relateid = f"{relateid:010d}"
 
-        i = bisect_left(self.relateid, relateid)
+        i = np.searchsorted(self.relateid, relateid)
         if i == len(self.relateid) or self.relateid[i] != relateid:
             return None
-        return self.welldata[i]
+        return self._rows([i])[0]
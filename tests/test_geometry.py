@@ -0,0 +1,26 @@
+"""Tests for akeyaa.geometry."""
+
+import numpy as np
+
+from akeyaa.geometry import Polygon
+
+
+def test_polygon_contains_points():
+    """An L-shaped polygon uses the hull prefilter and then the exact path."""
+    polygon = Polygon([[0, 0], [2, 0], [2, 1], [1, 1], [1, 2], [0, 2], [0, 0]])
+    points = [[0.5, 0.5], [1.5, 0.5], [0.5, 1.5], [1.5, 1.5], [3.0, 3.0]]
+
+    assert not polygon.convex
+    np.testing.assert_array_equal(
+        polygon.contains_points(points), [True, True, True, False, False]
+    )
+
+
+def test_polygon_degenerate():
+    """A collinear ring has no convex hull; the exact path test decides."""
+    polygon = Polygon([[0, 0], [1, 1], [2, 2], [0, 0]])
+    points = [[1.0, 0.0], [0.0, 2.0], [1.5, 1.0]]
+
+    assert polygon.hull is polygon.path
+    assert not polygon.convex
+    assert not np.any(polygon.contains_points(points))
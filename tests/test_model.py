@@ -0,0 +1,19 @@
+"""Tests for akeyaa.model."""
+
+import numpy as np
+
+from akeyaa.model import fit_conic_potential
+
+
+def test_fit_conic_potential_zero_column():
+    """All wells on the target's easting give all-zero x^2, xy, and x columns."""
+    y = np.linspace(-100.0, 100.0, 30)
+    head = 300.0 + 0.01 * y - 2.0e-5 * y**2                                    # [m]
+    xyz = np.column_stack([np.full(30, 5.0), y, head / 0.3048])
+
+    evp, varp = fit_conic_potential(np.array([5.0, 0.0]), xyz)
+
+    assert np.all(np.isfinite(evp))
+    assert np.all(np.isfinite(varp))
+    np.testing.assert_allclose(evp[[1, 4, 5]], [-2.0e-5, 0.01, 300.0], rtol=1e-6)
+    np.testing.assert_allclose(evp[[0, 2, 3]], 0.0, atol=1e-9)